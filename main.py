@@ -14,50 +14,59 @@ st.set_page_config(
 
 # Now import other libraries
 from docx import Document
-from docx.shared import Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Pt, Inches, Emu, Twips
+from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_LINE_SPACING
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+import io
 import tempfile
 import os
-import json
-import pdfplumber
-from docx2python import docx2python
-from textblob import TextBlob
-from PIL import Image
-import nltk
+import copy
+import hashlib
+import zipfile
+import threading
+from xml.etree import ElementTree
+from pathlib import Path
+from functools import lru_cache
 import subprocess
 import sys
-import pandas as pd
 from difflib import SequenceMatcher
 import re
 
 # -------------------- Setup NLTK Data --------------------
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'brown': 'corpora/brown'
+}
+
 @st.cache_resource
 def setup_nltk():
+    import nltk
+    missing = []
+    for package, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
     try:
-        nltk.data.find('tokenizers/punkt')
+        for package in missing:
+            nltk.download(package, quiet=True, raise_on_error=True)
         return True
-    except LookupError:
-        try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('averaged_perceptron_tagger', quiet=True)
-            nltk.download('brown', quiet=True)
-            return True
-        except Exception as e:
-            st.error(f"NLTK data download failed: {str(e)}")
-            st.warning("""
-            **Manual fix required:**
-            1. Run this command locally:
-            ```bash
-            python -m textblob.download_corpora
-            ```
-            2. Then redeploy your app
-            """)
-            return False
-
-if not setup_nltk():
-    st.stop()
+    except Exception as e:
+        st.error(f"NLTK data download failed: {str(e)}")
+        st.warning("""
+        **Manual fix required:**
+        1. Run this command locally:
+        ```bash
+        python -m textblob.download_corpora
+        ```
+        2. Then redeploy your app
+        """)
+        return False
 
 # -------------------- Enhanced Grammar Tools --------------------
+@lru_cache(maxsize=10_000)
 def get_closest_match(word):
     """Get closest dictionary match for misspelled words"""
     from textblob import Word
@@ -66,8 +75,13 @@ def get_closest_match(word):
         return suggestions[0][0]  # Return the most likely correction
     return word
 
+def get_closest_matches(words):
+    """Map each distinct word to its closest dictionary match"""
+    return {word: get_closest_match(word) for word in set(words)}
+
 # def improved_grammar_check(text):
 #     """Enhanced grammar checking with better suggestions"""
+#     from textblob import TextBlob
 #     try:
 #         # First get TextBlob's suggestions
 #         blob = TextBlob(text)
@@ -120,54 +134,191 @@ def get_closest_match(word):
 #         return []
 
 # -------------------- Text Processing Tools --------------------
-def extract_text_from_file(uploaded_file):
-    """Extract text from PDF, DOC, or DOCX files with better formatting"""
-    try:
-        if uploaded_file.type == "application/pdf":
-            with pdfplumber.open(uploaded_file) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
+MAX_CHECK_CHARS = 10000  # grammar checks only ever look at this much text
+
+def take_chars(chunks, limit):
+    """Yield chunks until at least `limit` characters have been produced (everything if limit is None)"""
+    total = 0
+    for chunk in chunks:
+        yield chunk
+        total += len(chunk)
+        if limit is not None and total >= limit:
+            return
+
+def clip_text(text, limit):
+    """Trim text to at most `limit` characters, ending on a sentence boundary when possible"""
+    if len(text) <= limit:
+        return text
+    # Only take a sentence or word break near the limit; list-style or CJK text may
+    # have its last '. ' or space right at the top
+    start = int(limit * 0.8)
+    cut = text.rfind('. ', start, limit)
+    if cut > 0:
+        return text[:cut + 1]
+    cut = max(text.rfind(ws, start, limit) for ws in " \n\t")
+    return text[:cut] if cut > 0 else text[:limit]
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Run children that stand for whitespace, mapped the same way python-docx's Run.text does
+RUN_BREAKS = {W_NS + "tab": "\t", W_NS + "br": "\n", W_NS + "cr": "\n"}
+
+def iter_run_text(p):
+    """Yield the text pieces of a paragraph's runs in document order"""
+    for r in p.iter(W_NS + "r"):
+        for child in r:
+            if child.tag == W_NS + "t":
+                yield child.text or ""
+            elif child.tag in RUN_BREAKS:
+                yield RUN_BREAKS[child.tag]
+
+def iter_docx_paragraphs(file_bytes):
+    """Yield the plain text of each paragraph in a DOCX body, streaming document.xml"""
+    with zipfile.ZipFile(io.BytesIO(file_bytes)) as zf, zf.open("word/document.xml") as xml:
+        for _, el in ElementTree.iterparse(xml):
+            if el.tag == W_NS + "p":
+                yield "".join(iter_run_text(el))
+                el.clear()
+
+@st.cache_resource
+def pdfium_lock():
+    """Process-wide lock for PDFium, which isn't thread-safe while Streamlit runs each session on its own thread"""
+    return threading.Lock()
+
+def iter_pdf_pages(file_bytes, limit=None):
+    """Yield the text of each PDF page with PDFium, handing over to pdfplumber if PDFium can't read it"""
+    import pypdfium2 as pdfium
+    # Collect every PDFium result under the lock; nothing is yielded while it is held
+    texts, done, failed = [], 0, False
+    with pdfium_lock():
+        try:
+            pdf = pdfium.PdfDocument(file_bytes)
+            try:
+                total = 0
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    page_text = textpage.get_text_bounded()
+                    textpage.close()
+                    page.close()
+                    done += 1
                     if page_text:
-                        text += page_text + "\n\n"
-                return text.strip()
+                        texts.append(page_text.replace("\r\n", "\n"))
+                        total += len(texts[-1])
+                        if limit is not None and total >= limit:
+                            break
+            finally:
+                pdf.close()
+        except pdfium.PdfiumError:
+            failed = True
+    yield from texts
+    if failed:
+        # Pick up from the page PDFium failed on so earlier pages aren't repeated
+        yield from iter_pdfplumber_pages(file_bytes, start=done)
+
+def iter_pdfplumber_pages(file_bytes, start=0):
+    """Yield the text of each PDF page from `start`, dropping pdfplumber's per-page caches as we go"""
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        for page in pdf.pages[start:]:
+            page_text = page.extract_text()
+            page.flush_cache()
+            if page_text:
+                yield page_text
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def extract_text_from_file(file_bytes, mime_type, char_limit=None):
+    """Extract text from PDF, DOC, or DOCX files (cached per file contents; PDFs stop at char_limit)"""
+    try:
+        if mime_type == "application/pdf":
+            return "\n\n".join(take_chars(iter_pdf_pages(file_bytes, char_limit), char_limit)).strip()
         
-        elif uploaded_file.type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                  "application/msword"]:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                tmp.write(uploaded_file.getvalue())
-                docx_content = docx2python(tmp.name)
-                text = docx_content.text
-                os.unlink(tmp.name)
-                return text
+        elif mime_type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                           "application/msword"]:
+            return "\n\n".join(iter_docx_paragraphs(file_bytes))
     except Exception as e:
         st.error(f"Text extraction error: {str(e)}")
         return ""
 
 # -------------------- DocuMorph Engine --------------------
+ALIGN_MAP = {
+    "Left": WD_ALIGN_PARAGRAPH.LEFT,
+    "Center": WD_ALIGN_PARAGRAPH.CENTER,
+    "Right": WD_ALIGN_PARAGRAPH.RIGHT,
+    "Justify": WD_ALIGN_PARAGRAPH.JUSTIFY
+}
+HF_ALIGN_OPTIONS = ["Left", "Center", "Right"]
+FONT_OPTIONS = ["Times New Roman", "Arial", "Calibri", "Georgia"]
+IMAGE_DPI = 150
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def downscale_image(data, width, height, dpi=IMAGE_DPI):
+    """Re-encode image bytes at print size (None if already small enough), cached so repeat exports skip the decode"""
+    from PIL import Image, ImageOps
+    img = Image.open(io.BytesIO(data))
+    source_format = img.format  # exif_transpose returns a new image without .format
+    img = ImageOps.exif_transpose(img)  # rotate camera photos upright; EXIF is dropped on save
+    target = (int(width * dpi), int(height * dpi))
+    if img.width <= target[0] and img.height <= target[1]:
+        return None
+    # PNG artwork stays lossless; photos are re-encoded as JPEG
+    keep_png = source_format == "PNG" or img.mode in ("RGBA", "LA", "P")
+    if img.mode == "P" or "transparency" in img.info:
+        img = img.convert("RGBA")  # carry palette/tRNS transparency through the resample
+    # add_picture stretches to exactly width x height, so size each axis to its own
+    # target rather than keeping the source aspect ratio; never upscale an axis
+    img = img.resize((min(img.width, target[0]), min(img.height, target[1])), Image.LANCZOS)
+    buf = io.BytesIO()
+    if keep_png:
+        img.save(buf, "PNG", optimize=True)
+    else:
+        img.convert("RGB").save(buf, "JPEG", quality=85, optimize=True)
+    return buf.getvalue()
+
+def prepare_image(image, width, height, dpi=IMAGE_DPI):
+    """Downscale an image to the size it is printed at so the DOCX doesn't embed full-resolution photos"""
+    image.seek(0)
+    data = image.read()
+    return io.BytesIO(downscale_image(data, width, height, dpi) or data)
+
 class DocuMorphEngine:
-    def __init__(self, docx_file=None):
-        self.document = Document(docx_file) if docx_file else Document()
+    def __init__(self, docx_file=None, document=None):
+        if document is not None:
+            self.document = document
+        else:
+            self.document = Document(docx_file) if docx_file else Document()
 
     def set_font(self, font_name, font_size):
+        size = Pt(font_size)
         for para in self.document.paragraphs:
             for run in para.runs:
                 run.font.name = font_name
-                run.font.size = Pt(font_size)
+                run.font.size = size
 
     def set_line_spacing(self, spacing):
         for para in self.document.paragraphs:
             para.paragraph_format.line_spacing = spacing
 
     def set_alignment(self, alignment):
-        align_map = {
-            "Left": WD_ALIGN_PARAGRAPH.LEFT,
-            "Center": WD_ALIGN_PARAGRAPH.CENTER,
-            "Right": WD_ALIGN_PARAGRAPH.RIGHT,
-            "Justify": WD_ALIGN_PARAGRAPH.JUSTIFY
-        }
+        align = ALIGN_MAP.get(alignment, WD_ALIGN_PARAGRAPH.LEFT)
         for para in self.document.paragraphs:
-            para.alignment = align_map.get(alignment, WD_ALIGN_PARAGRAPH.LEFT)
+            para.alignment = align
+
+    def apply_formatting(self, font_name, font_size, spacing, alignment):
+        """Apply font, line spacing and alignment in a single pass over the body XML"""
+        size = Pt(font_size)
+        line = Emu(spacing * Twips(240))
+        align = ALIGN_MAP.get(alignment, WD_ALIGN_PARAGRAPH.LEFT)
+        # Work on the <w:p>/<w:r> elements directly; going through
+        # Paragraph/Run/Font wrappers costs several lxml lookups per property
+        for p in self.document.element.body.iterchildren(qn('w:p')):
+            pPr = p.get_or_add_pPr()
+            pPr.spacing_line = line
+            pPr.spacing_lineRule = WD_LINE_SPACING.MULTIPLE
+            pPr.jc_val = align
+            for r in p.iterchildren(qn('w:r')):
+                rPr = r.get_or_add_rPr()
+                rPr.rFonts_ascii = font_name
+                rPr.rFonts_hAnsi = font_name
+                rPr.sz_val = size
 
     def set_margins(self, top, bottom, left, right):
         sec = self.document.sections[0]
@@ -181,14 +332,11 @@ class DocuMorphEngine:
         if not hdr.paragraphs:
             hdr.add_paragraph()
         run = hdr.paragraphs[0].add_run()
-        run.add_picture(image, width=Inches(width), height=Inches(height))
+        run.add_picture(prepare_image(image, width, height), width=Inches(width), height=Inches(height))
 
     def set_header_footer(self, h_text, f_text, size, align):
-        align_map = {
-            "Left": WD_ALIGN_PARAGRAPH.LEFT,
-            "Center": WD_ALIGN_PARAGRAPH.CENTER,
-            "Right": WD_ALIGN_PARAGRAPH.RIGHT
-        }
+        alignment = ALIGN_MAP.get(align, WD_ALIGN_PARAGRAPH.LEFT)
+        font_size = Pt(size)
         for sec in self.document.sections:
             # Header
             if not sec.header.paragraphs:
@@ -196,8 +344,8 @@ class DocuMorphEngine:
             h_para = sec.header.paragraphs[0]
             h_para.text = h_text
             if h_para.runs:
-                h_para.runs[0].font.size = Pt(size)
-            h_para.alignment = align_map.get(align, WD_ALIGN_PARAGRAPH.LEFT)
+                h_para.runs[0].font.size = font_size
+            h_para.alignment = alignment
             
             # Footer
             if not sec.footer.paragraphs:
@@ -205,50 +353,105 @@ class DocuMorphEngine:
             f_para = sec.footer.paragraphs[0]
             f_para.text = f_text
             if f_para.runs:
-                f_para.runs[0].font.size = Pt(size)
-            f_para.alignment = align_map.get(align, WD_ALIGN_PARAGRAPH.LEFT)
+                f_para.runs[0].font.size = font_size
+            f_para.alignment = alignment
 
     def add_section_title(self, title):
         self.document.add_heading(title, level=1)
 
     def add_bullet_list(self, items):
+        # Build every bullet first, then splice them in ahead of sectPr in one go;
+        # appending one at a time rescans the body's children for sectPr per item
+        items = list(items)
+        if not items:
+            return
+        try:
+            style_id = self.document.styles["List Bullet"].style_id
+        except KeyError:
+            raise ValueError("the uploaded document has no 'List Bullet' style for bullet points") from None
+        bullets = []
         for item in items:
-            self.document.add_paragraph(item, style="List Bullet")
+            p = OxmlElement('w:p')
+            p.style = style_id
+            p.add_r().text = item
+            bullets.append(p)
+        body = self.document.element.body
+        end = len(body) if body.sectPr is None else body.index(body.sectPr)
+        body[end:end] = bullets
 
     def add_figure(self, image, w, h, caption="", pos="Below"):
         if pos == "Above" and caption:
             self.document.add_paragraph(caption, style="Caption")
         p = self.document.add_paragraph()
         run = p.add_run()
-        run.add_picture(image, width=Inches(w), height=Inches(h))
+        run.add_picture(prepare_image(image, w, h), width=Inches(w), height=Inches(h))
         if pos == "Below" and caption:
             self.document.add_paragraph(caption, style="Caption")
 
     def save(self, path):
         self.document.save(path)
 
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_document(digest, _upload):
+    """Parse an uploaded DOCX once per distinct file (deep-copy before mutating)"""
+    _upload.seek(0)
+    return Document(_upload)
+
 # -------------------- Template Manager --------------------
 TEMPLATE_DIR = "templates"
 os.makedirs(TEMPLATE_DIR, exist_ok=True)
 
+# orjson is much faster, but templates still work with the stdlib if it's missing
+try:
+    import orjson
+
+    def dump_json(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    load_json = orjson.loads
+except ImportError:
+    import json
+
+    def dump_json(obj):
+        return json.dumps(obj, indent=4).encode()
+
+    load_json = json.loads
+
+@st.cache_data(max_entries=1)
+def scan_templates(mtime_ns):
+    """List template names; mtime_ns is only the cache key"""
+    with os.scandir(TEMPLATE_DIR) as entries:
+        return [e.name[:-5] for e in entries if e.name.endswith('.json') and e.is_file()]
+
 def list_templates():
-    return [f[:-5] for f in os.listdir(TEMPLATE_DIR) if f.endswith('.json')]
+    return scan_templates(os.stat(TEMPLATE_DIR).st_mtime_ns)
 
 def load_template(name):
-    path = os.path.join(TEMPLATE_DIR, f"{name}.json")
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            return json.load(f)
-    return None
+    try:
+        return load_json(Path(TEMPLATE_DIR, f"{name}.json").read_bytes())
+    except FileNotFoundError:
+        return None
 
 def save_template(name, cfg):
-    with open(os.path.join(TEMPLATE_DIR, f"{name}.json"), "w") as f:
-        json.dump(cfg, f, indent=4)
+    # Write to a temp file and swap it in so a concurrent load never sees a half-written template
+    tmp = tempfile.NamedTemporaryFile("wb", dir=TEMPLATE_DIR, suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            tmp.write(dump_json(cfg))
+        # NamedTemporaryFile creates 0600; give the template the directory's umask-based mode
+        os.chmod(tmp.name, os.stat(TEMPLATE_DIR).st_mode & 0o666)
+        os.replace(tmp.name, Path(TEMPLATE_DIR, f"{name}.json"))
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    scan_templates.clear()
 
 def delete_template(name):
-    path = os.path.join(TEMPLATE_DIR, f"{name}.json")
-    if os.path.exists(path):
-        os.remove(path)
+    try:
+        os.remove(os.path.join(TEMPLATE_DIR, f"{name}.json"))
+    except FileNotFoundError:
+        pass
+    scan_templates.clear()
 
 # -------------------- Streamlit UI --------------------
 # Custom CSS
@@ -370,8 +573,8 @@ with tab1:
     with col1:
         font_name = st.selectbox(
             "Font", 
-            ["Times New Roman", "Arial", "Calibri", "Georgia"],
-            index=["Times New Roman", "Arial", "Calibri", "Georgia"].index(config.get("font_name", "Times New Roman")),
+            FONT_OPTIONS,
+            index=FONT_OPTIONS.index(config.get("font_name", "Times New Roman")),
             key="font_name"
         )
         font_size = st.slider(
@@ -387,8 +590,8 @@ with tab1:
     with col2:
         alignment = st.selectbox(
             "Alignment",
-            ["Left", "Center", "Right", "Justify"],
-            index=["Left", "Center", "Right", "Justify"].index(config.get("alignment", "Left")),
+            list(ALIGN_MAP),
+            index=list(ALIGN_MAP).index(config.get("alignment", "Left")),
             key="alignment"
         )
         st.write("Margins (inches):")
@@ -442,8 +645,8 @@ with tab2:
         )
         hf_align = st.selectbox(
             "Header/Footer Alignment",
-            ["Left", "Center", "Right"],
-            index=["Left", "Center", "Right"].index(config.get("hf_align", "Center")),
+            HF_ALIGN_OPTIONS,
+            index=HF_ALIGN_OPTIONS.index(config.get("hf_align", "Center")),
             key="hf_align"
         )
     
@@ -495,10 +698,10 @@ with tab3:
         )
         if grammar_file:
             with st.spinner("Extracting text..."):
-                extracted_text = extract_text_from_file(grammar_file)
+                extracted_text = extract_text_from_file(grammar_file.getvalue(), grammar_file.type, MAX_CHECK_CHARS)
                 if extracted_text:
                     st.subheader("Extracted Text Preview")
-                    st.markdown(f'<div class="extracted-text">{extracted_text[:5000]}</div>', unsafe_allow_html=True)
+                    st.markdown(f'<div class="extracted-text">{clip_text(extracted_text, 5000)}</div>', unsafe_allow_html=True)
                     text_to_check = extracted_text
     else:
         text_to_check = st.text_area(
@@ -509,6 +712,8 @@ with tab3:
     
     # if text_to_check and st.button("Run Advanced Grammar Check", use_container_width=True):
     #     with st.spinner("Analyzing content..."):
+    #         if not setup_nltk():  # corpora are only needed by the grammar check
+    #             st.stop()
     #         issues = improved_grammar_check(text_to_check[:10000])  # Limit to first 10k chars
             
     #         if not issues:
@@ -551,70 +756,69 @@ with tab4:
         else:
             with st.spinner("Formatting document..."):
                 try:
-                    # Initialize engine
-                    engine = DocuMorphEngine(doc_file)
+                    ss = st.session_state
+                    
+                    # Initialize engine from the cached parse of this upload
+                    digest = hashlib.blake2b(doc_file.getbuffer(), digest_size=16).hexdigest()
+                    document = load_document(digest, doc_file)
+                    engine = DocuMorphEngine(document=copy.deepcopy(document))
                     
                     # Apply formatting
-                    engine.set_font(
-                        st.session_state.font_name,
-                        st.session_state.font_size
+                    engine.apply_formatting(
+                        ss.font_name,
+                        ss.font_size,
+                        ss.line_spacing,
+                        ss.alignment
                     )
-                    engine.set_line_spacing(st.session_state.line_spacing)
-                    engine.set_alignment(st.session_state.alignment)
                     engine.set_margins(
-                        st.session_state.margin_top,
-                        st.session_state.margin_bottom,
-                        st.session_state.margin_left,
-                        st.session_state.margin_right
+                        ss.margin_top,
+                        ss.margin_bottom,
+                        ss.margin_left,
+                        ss.margin_right
                     )
                     
                     # Add logo if uploaded
-                    if 'logo' in st.session_state and st.session_state.logo:
-                        st.session_state.logo.seek(0)
+                    if 'logo' in ss and ss.logo:
                         engine.add_logo(
-                            st.session_state.logo,
-                            st.session_state.logo_width,
-                            st.session_state.logo_height
+                            ss.logo,
+                            ss.logo_width,
+                            ss.logo_height
                         )
                     
                     # Add header/footer
                     engine.set_header_footer(
-                        st.session_state.header_text,
-                        st.session_state.footer_text,
-                        st.session_state.hf_size,
-                        st.session_state.hf_align
+                        ss.header_text,
+                        ss.footer_text,
+                        ss.hf_size,
+                        ss.hf_align
                     )
                     
                     # Add content
-                    if st.session_state.section_title.strip():
-                        engine.add_section_title(st.session_state.section_title.strip())
+                    section_title = ss.section_title.strip()
+                    if section_title:
+                        engine.add_section_title(section_title)
                     
-                    if st.session_state.bullets.strip():
-                        bullets = [b.strip() for b in st.session_state.bullets.split("\n") if b.strip()]
-                        engine.add_bullet_list(bullets)
+                    engine.add_bullet_list(filter(None, map(str.strip, ss.bullets.splitlines())))
                     
-                    if 'figure' in st.session_state and st.session_state.figure:
-                        st.session_state.figure.seek(0)
+                    if 'figure' in ss and ss.figure:
                         engine.add_figure(
-                            st.session_state.figure,
-                            st.session_state.fig_width,
-                            st.session_state.fig_height,
-                            st.session_state.caption,
-                            st.session_state.caption_pos
+                            ss.figure,
+                            ss.fig_width,
+                            ss.fig_height,
+                            ss.caption,
+                            ss.caption_pos
                         )
                     
                     # Save and offer download
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-                        engine.save(tmp.name)
-                        with open(tmp.name, "rb") as f:
-                            st.download_button(
-                                "⬇ Download Formatted Document",
-                                f.read(),
-                                "formatted.docx",
-                                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                                use_container_width=True
-                            )
-                    os.unlink(tmp.name)
+                    buf = io.BytesIO()
+                    engine.save(buf)
+                    st.download_button(
+                        "⬇ Download Formatted Document",
+                        buf.getvalue(),
+                        "formatted.docx",
+                        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                        use_container_width=True
+                    )
                     
                 except Exception as e:
                     st.error(f"Error generating document: {str(e)}")
\ No newline at end of file